@@ -11,7 +11,8 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from datetime import date, timedelta
+from datetime import date
+from functools import lru_cache
 
 from .ymd import from_excel_to_ymd, from_ymd_to_excel
 
@@ -19,34 +20,44 @@ from .ymd import from_excel_to_ymd, from_ymd_to_excel
 class BaseDateFloat(float):
     """ native :class:`float` backed base class
     for a performing date calculations counting days since Jan, 1st 1900 """
+    __slots__ = '_ymd',
 
     def __new__(cls, x=0):
+        if cls is BaseDateFloat:
+            # only instances of this very class are immutable and shared,
+            # subclasses have a __dict__ and get attributes set
+            return _pooled_base_date_float(x)
+        return cls._new(x)
+
+    @classmethod
+    def _new(cls, x):
         new = super(BaseDateFloat, cls).__new__(cls, x)
-        new._ymd = None
+        new._ymd = from_excel_to_ymd(int(new))
         return new
 
+    def __reduce__(self):
+        # _ymd is restored by __new__, subclasses keep their __dict__
+        return self.__class__, (float(self),), getattr(self, '__dict__', None)
+
     # --- property methods ---------------------------------------------------
 
     @property
     def day(self):
-        if not self._ymd:
-            self._ymd = self.to_ymd()
         return self._ymd[2]
 
     @property
     def month(self):
-        if not self._ymd:
-            self._ymd = self.to_ymd()
         return self._ymd[1]
 
     @property
     def year(self):
-        if not self._ymd:
-            self._ymd = self.to_ymd()
         return self._ymd[0]
 
     def weekday(self):
-        return self.to_date().weekday()
+        # int 1 is Monday, Jan, 1st 1900 and int 60 and 61 are both Mar, 1st 1900
+        n = int(self)
+        n -= 1 if n > 60 else 0
+        return (n + 6) % 7
 
     # --- constructor method -------------------------------------------------
 
@@ -69,14 +80,10 @@ class BaseDateFloat(float):
 
     def to_ymd(self):
         """ returns the :class:`tuple` of :class:`int` items `(year, month, day)` """
-        if not self._ymd:
-            self._ymd = from_excel_to_ymd(int(self))
         return self._ymd
 
     def to_date(self):
         """ returns `datetime.date(year, month, day)` """
-        if not self._ymd:
-            self._ymd = self.to_ymd()
         return date(*self._ymd)
 
     def to_float(self):
@@ -86,11 +93,15 @@ class BaseDateFloat(float):
     # --- calculation methods ------------------------------------------------
 
     def _add_days(self, n):
-        self._ymd = None
-        return self.__class__(super(BaseDateFloat, self).__add__(n))
+        return self.__class__(float.__add__(self, n))
 
     def _diff_in_days(self, d):
-        return super(BaseDateFloat, d).__sub__(float(self))
+        return float.__sub__(d, float(self))
+
+
+@lru_cache(maxsize=4096)
+def _pooled_base_date_float(x):
+    return BaseDateFloat._new(x)
 
 
 class BaseDateDatetimeDate(date):
@@ -123,11 +134,11 @@ class BaseDateDatetimeDate(date):
 
     def to_date(self):
         """ returns `datetime.date(year, month, day)` """
-        return date(*self.to_ymd())
+        return date(self.year, self.month, self.day)
 
     def to_float(self):
         """ returns :class:`float` counting the days since Jan, 1st 1900 """
-        return float(from_ymd_to_excel(*self.to_ymd()))
+        return float(from_ymd_to_excel(self.year, self.month, self.day))
 
     def to_serializable(self, *args, **kwargs):
         return str(self)
@@ -135,10 +146,7 @@ class BaseDateDatetimeDate(date):
     # --- calculation methods ------------------------------------------------
 
     def _add_days(self, days_int):
-        # return super(self.__class__, self).__add__(timedelta(days_int))
-        res = super(BaseDateDatetimeDate, self).__add__(timedelta(days_int))
-        return self.__class__.from_ymd(res.year, res.month, res.day)
+        return self.__class__.fromordinal(self.toordinal() + days_int)
 
     def _diff_in_days(self, end):
-        delta = super(BaseDateDatetimeDate, end).__sub__(self)
-        return float(delta.days)
+        return end.toordinal() - self.toordinal()
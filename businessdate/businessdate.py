@@ -11,18 +11,65 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from datetime import date, datetime, timedelta
+import re
+from datetime import date, timedelta
+from functools import lru_cache
 
 from . import conventions
 from . import daycount
 from .ymd import is_leap_year, days_in_year, days_in_month, \
     end_of_quarter_month, from_excel_to_ymd
 from .basedate import BaseDateFloat, BaseDateDatetimeDate
-from .businessholidays import TargetHolidays
+from .businessholidays import BusinessHolidays, TargetHolidays
 from .businessperiod import BusinessPeriod
 
 
 DATE_TYPES = date, BaseDateFloat, BaseDateDatetimeDate
+_PLAIN_TYPES = frozenset((type(None), int, float, str, date))
+
+#: compiled pattern of '%Y-%m-%d', '%d.%m.%Y', '%m/%d/%Y' and '%Y%m%d' strings
+_DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})|(\d{1,2})\.(\d{1,2})\.(\d{4})|'
+                           r'(\d{1,2})/(\d{1,2})/(\d{4})|(\d{4})(\d\d)(\d\d)')
+#: (year, month, day) group numbers by last group number of each format
+_DATE_GROUPS = {3: (1, 2, 3), 6: (6, 5, 4), 9: (9, 7, 8), 12: (10, 11, 12)}
+
+
+@lru_cache(maxsize=4096)
+def _match_date_string(date_str):
+    """ (year, month, day) of '%Y-%m-%d', '%d.%m.%Y', '%m/%d/%Y' or '%Y%m%d'
+    strings and None otherwise (memoized as schedules repeat date strings) """
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if match:
+        y, m, d = match.group(*_DATE_GROUPS[match.lastindex])
+        return int(y), int(m), int(d)
+    return None
+
+
+#: str.format templates of common strftime formats taking (year, month, day)
+_DATE_FORMATS = {
+    '%Y%m%d': '{0}{1:02d}{2:02d}',
+    '%Y-%m-%d': '{0}-{1:02d}-{2:02d}',
+    '%d.%m.%Y': '{2:02d}.{1:02d}.{0}',
+    '%m/%d/%Y': '{1:02d}/{2:02d}/{0}',
+}
+
+
+def _weekdays_until(ordinal):
+    """ number of weekdays with ordinals in [1, ordinal] """
+    # ordinal 1 is a monday, so ordinal % 7 is 0 on sundays and 6 on saturdays
+    return 5 * (ordinal // 7) + min(ordinal % 7, 5)
+
+
+def _weekday_ordinal(count):
+    """ ordinal of the count-th weekday, i.e. inverse of _weekdays_until """
+    weeks, days = divmod(count - 1, 5)
+    return 7 * weeks + days + 1
+
+
+#: membership lookups of holiday calendars which can be counted by
+#: BusinessHolidays._count_weekday_holidays instead of day by day
+_COUNTABLE_CONTAINS = \
+    BusinessHolidays.__contains__, TargetHolidays.__contains__
 
 
 class BusinessDayCount(object):
@@ -93,6 +140,8 @@ class BusinessDate(BaseDateDatetimeDate):
         'cdsimm': conventions.adjust_cds_imm,
         'cds': conventions.adjust_cds_imm,
     }
+    #: tuple: (upper, key) pairs of _adj_func keys, longest first
+    _adj_keys = tuple((a.upper(), a) for a in sorted(_adj_func, key=len, reverse=True))
     _dc_func = {
         '30_360': daycount.get_30_360,
         '30360': daycount.get_30_360,
@@ -143,19 +192,19 @@ class BusinessDate(BaseDateDatetimeDate):
             :class:`datetime.date` which is used as default for 
             :meth:`BusinessDate.adjust`.
         '''
+        if year is None:
+            # default date, taken straight to native construction if possible
+            year = date.today() if cls.BASE_DATE is None else cls.BASE_DATE
+            if isinstance(year, DATE_TYPES):
+                year, month, day = year.year, year.month, year.day
+
         if year and month and day:
             # native construction
             if 12 < month:
                 year += int(month // 12)
                 month = int(month % 12)
-            if issubclass(cls, BaseDateFloat):
-                new = cls.from_ymd(year, month, day)
-            else:
-                new = super(BusinessDate, cls).__new__(cls, year, month, day)
-            new.convention = convention
-            new.holidays = holidays
-            new.day_count = day_count
-            return new
+            return cls._from_ymd(year, month, day,
+                                 convention, holidays, day_count)
 
         if isinstance(year, BusinessDate):
             # second most native construction
@@ -165,8 +214,8 @@ class BusinessDate(BaseDateDatetimeDate):
                 holidays = getattr(year, 'holidays', None)
             if day_count is None:
                 day_count = getattr(year, 'day_count', None)
-            year, month, day = year.year, year.month, year.day
-            return cls(year, month, day, convention, holidays, day_count)
+            return cls._from_ymd(year.year, year.month, year.day,
+                                 convention, holidays, day_count)
 
         if isinstance(year, timedelta):
             return cls()._add_days(year.days)
@@ -181,8 +230,11 @@ class BusinessDate(BaseDateDatetimeDate):
             return year.__class__((BusinessDate(y, **kwargs) for y in year))
 
         # use date construction attribute
+        # (skipped for plain built-in input types which have none of them)
 
-        if hasattr(year, '__ts__'):
+        if type(year) in _PLAIN_TYPES:
+            pass
+        elif hasattr(year, '__ts__'):
             year = year.__ts__
             year = year() if callable(year) else year
         elif hasattr(year, '__timestamp__'):
@@ -200,16 +252,13 @@ class BusinessDate(BaseDateDatetimeDate):
 
         # gather year, month and day from year
 
-        if year is None:
-            year = date.today() if cls.BASE_DATE is None else cls.BASE_DATE
-
         if isinstance(year, DATE_TYPES):
             year, month, day = year.year, year.month, year.day
 
         elif isinstance(year, (int, float)) and 10000101 <= year:
             # start 20191231 representation from 1000 a.d.
-            ymd = str(year)
-            year, month, day = int(ymd[:4]), int(ymd[4:6]), int(ymd[6:])
+            year, month_day = divmod(int(year), 10000)
+            month, day = divmod(month_day, 100)
 
         elif isinstance(year, (int, float)) and 1 < year < 10000101:
             # excel representation before 1000 a.d.
@@ -220,15 +269,8 @@ class BusinessDate(BaseDateDatetimeDate):
                 cls._parse_date_string(year, default=(year, None, None))
 
         if month and day:
-            if issubclass(cls, BaseDateFloat):
-                new = cls.from_ymd(year, month, day)
-            else:
-                new = super(BusinessDate, cls).__new__(cls, year, month, day)
-            # set additional properties
-            new.convention = convention
-            new.holidays = holidays
-            new.day_count = day_count
-            return new
+            return cls._from_ymd(year, month, day,
+                                 convention, holidays, day_count)
 
         # finally, try to split complex or period input,
         # e.g. '0B1D2BMOD20191231' or '3Y2M1D' or '-2B'
@@ -236,23 +278,26 @@ class BusinessDate(BaseDateDatetimeDate):
 
 
     @classmethod
-    def _parse_date_string(cls, date_str, default=None):
-        date_str = str(date_str)
-        if date_str.count('-'):
-            str_format = '%Y-%m-%d'
-        elif date_str.count('.'):
-            str_format = '%d.%m.%Y'
-        elif date_str.count('/'):
-            str_format = '%m/%d/%Y'
-        elif len(date_str) == 8 and date_str.isdigit():
-            str_format = '%Y%m%d'
+    def _from_ymd(cls, year, month, day,
+                  convention=None, holidays=None, day_count=None):
+        # native construction without any input dispatch
+        if issubclass(cls, BaseDateFloat):
+            new = cls.from_ymd(year, month, day)
         else:
-            str_format = ''
-        if str_format:
-            date_date = datetime.strptime(date_str, str_format)
-            return date_date.year, date_date.month, date_date.day
+            new = super(BusinessDate, cls).__new__(cls, year, month, day)
+        # set additional properties
+        new.convention = convention
+        new.holidays = holidays
+        new.day_count = day_count
+        return new
 
-        if default is None:
+    @classmethod
+    def _parse_date_string(cls, date_str, default=None):
+        date_str = str(date_str)
+        ymd = _match_date_string(date_str)
+        if ymd:
+            return ymd
+        if default is None or '-' in date_str or '.' in date_str or '/' in date_str:
             raise ValueError("The input %s has not the right format for %s" % (
             date_str, cls.__name__))
         return default
@@ -264,17 +309,19 @@ class BusinessDate(BaseDateDatetimeDate):
 
         # first, extract origin
         if len(date_str) > 8:
-            try:
-                datetime.strptime(date_str[-8:], '%Y%m%d')
-                origin = date_str[-8:]
-                date_str = date_str[:-8]
-            except ValueError:
-                # no date found a the end of the string
-                pass
+            tail = date_str[-8:]
+            if tail.isdigit():
+                try:
+                    date(int(tail[:4]), int(tail[4:6]), int(tail[6:]))
+                    origin = tail
+                    date_str = date_str[:-8]
+                except ValueError:
+                    # no valid date found a the end of the string
+                    pass
 
         # second, extract convention
-        for a in sorted(cls._adj_func.keys(), key=len, reverse=True):
-            if date_str.find(a.upper()) >= 0:
+        for upper, a in cls._adj_keys:
+            if upper in date_str:
                 convention = a
                 date_str = date_str[:-len(a)]
                 break
@@ -321,10 +368,9 @@ class BusinessDate(BaseDateDatetimeDate):
         return self.__deepcopy__()
 
     def __deepcopy__(self, memodict={}):
-        return BusinessDate(str(self),
-                            convention=self.convention,
-                            holidays=self.holidays,
-                            day_count=self.day_count)
+        return BusinessDate._from_ymd(self.year, self.month, self.day,
+                                      self.convention, self.holidays,
+                                      self.day_count)
 
     # --- operator methods ---------------------------------------------------
 
@@ -365,11 +411,14 @@ class BusinessDate(BaseDateDatetimeDate):
         return float(self - BusinessDate())
 
     def __int__(self):
-        y, m, d = self.to_ymd()
-        return int(f"{y:04}{m:02}{d:02}")
+        return self.year * 10000 + self.month * 100 + self.day
 
     def __str__(self):
         date_format = self.__class__.DATE_FORMAT
+        if date_format in _DATE_FORMATS and 999 < self.year:
+            # common formats without strftime (which pads years < 1000
+            # differently across platforms)
+            return _DATE_FORMATS[date_format].format(self.year, self.month, self.day)
         return self.to_date().strftime(date_format)
 
     def __repr__(self):
@@ -408,8 +457,8 @@ class BusinessDate(BaseDateDatetimeDate):
 
     def end_of_quarter(self):
         """ returns the day of the end of the quarter as :class:`BusinessDate` object"""
-        return BusinessDate(self.year, end_of_quarter_month(self.month),
-                            0o1).end_of_month()
+        month = end_of_quarter_month(self.month)
+        return BusinessDate(self.year, month, days_in_month(self.year, month))
 
     def is_business_day(self, holidays=None):
         """ returns `True` if date falls neither on weekend
@@ -421,34 +470,57 @@ class BusinessDate(BaseDateDatetimeDate):
     # --- calculation methods --------------------------------------------
 
     def _add_business_days(self, days_int, holidays=None):
-        res = self.__deepcopy__()
-        if days_int >= 0:
-            count = 0
-            while count < days_int:
-                res = res._add_days(1)
-                if res.is_business_day(holidays):
-                    count += 1
-        else:
-            count = 0
-            while count > days_int:
-                res = res._add_days(-1)
-                if res.is_business_day(holidays):
-                    count -= 1
-        return res
+        if not days_int:
+            return self.__deepcopy__()
+        holidays = self.holidays if holidays is None else holidays
+        holidays = self.DEFAULT_HOLIDAYS if holidays is None else holidays
+        if type(holidays).__contains__ in _COUNTABLE_CONTAINS \
+                and 2 < abs(days_int):
+            # jump over weekends arithmetically and repeat for the holidays
+            # passed on the way until no more holidays are met
+            # (only for calendars whose lookup is known to be plain
+            # membership, since subclasses may fill themselves on lookup)
+            ordinal, count = self.toordinal(), abs(days_int)
+            if days_int > 0:
+                n = _weekdays_until(ordinal)
+                while count:
+                    n += count
+                    start, ordinal = ordinal + 1, _weekday_ordinal(n)
+                    count = holidays._count_weekday_holidays(start, ordinal)
+            else:
+                n = _weekdays_until(ordinal - 1) + 1
+                while count:
+                    n -= count
+                    end, ordinal = ordinal - 1, _weekday_ordinal(n)
+                    count = holidays._count_weekday_holidays(ordinal, end)
+            return self.__class__.fromordinal(ordinal)
+        # walk on ordinals, weekends are skipped arithmetically
+        # (ordinal % 7 is 0 on sundays and 6 on saturdays)
+        # and only weekdays are looked up in holidays
+        step = 1 if days_int > 0 else -1
+        ordinal, count = self.toordinal(), abs(days_int)
+        while count:
+            ordinal += step
+            if 0 < ordinal % 7 < 6 and date.fromordinal(ordinal) not in holidays:
+                count -= 1
+        return self.__class__.fromordinal(ordinal)
 
     def _add_ymd(self, years=0, months=0, days=0):
         y = self.year + years
-        m = self.month + months
-        while m < 1:
-            m += 12
-            y -= 1
-        som = self.__class__(y, m, 1)
-        d = min(self.day, som.days_in_month()) - 1 + days
-        new = som._add_days(d)
-        new.convention = self.convention
-        new.holidays = self.holidays
-        new.day_count = self.day_count
-        return new
+        if not months and not days:
+            # fast path for whole years, only Feb 29th needs clamping
+            m, d = self.month, self.day
+            if m == 2 and d == 29 and not is_leap_year(y):
+                d = 28
+        else:
+            q, m = divmod(self.month - 1 + months, 12)
+            y, m = y + q, m + 1
+            d = min(self.day, days_in_month(y, m))
+            if days:
+                new = date.fromordinal(date(y, m, d).toordinal() + days)
+                y, m, d = new.year, new.month, new.day
+        return self.__class__._from_ymd(y, m, d, self.convention,
+                                        self.holidays, self.day_count)
 
     def add_period(self, period_obj, holidays=None):
         """ adds a :class:`BusinessPeriod` object
@@ -459,42 +531,51 @@ class BusinessDate(BaseDateDatetimeDate):
         i.e. days neither weekend nor in holidays (see also :meth:`BusinessDate.is_business_day`)
         """
 
-        p = BusinessPeriod(period_obj)
+        if isinstance(period_obj, BusinessPeriod):
+            p = period_obj
+        else:
+            p = BusinessPeriod(period_obj)
         res = self
-        res = res._add_business_days(p.businessdays, holidays)
+        if p.businessdays:
+            res = res._add_business_days(p.businessdays, holidays)
         res = res._add_ymd(p.years, p.months, p.days)
         return res
 
     def diff_in_days(self, end_date):
         """ calculates the distance to a :class:`BusinessDate` in days """
-        return int(self._diff_in_days(end_date))
+        return self._diff_in_days(end_date)
 
     def diff_in_ymd(self, end_date):
 
         if end_date < self:
-            y, m, d = 0, 0, 0
-            while end_date < self._add_ymd(y, 0, 0):
+            # closed form of stepping back years, months and days
+            # until end_date is reached (one step of each at most)
+            y = end_date.year - self.year
+            if end_date < self._add_ymd(y, 0, 0):
                 y -= 1
-            while end_date < self._add_ymd(y + 1, m, 0):
+            m = (end_date.year - self.year - y - 1) * 12 + end_date.month - self.month
+            if end_date < self._add_ymd(y + 1, m, 0):
                 m -= 1
-            while end_date < self._add_ymd(y + 1, m + 1, d):
-                d -= 1
+            d = end_date.toordinal() - self._add_ymd(y + 1, m + 1, 0).toordinal()
             return y + 1, m + 1, d
 
         y = end_date.year - self.year
         m = end_date.month - self.month
         d = end_date.day - self.day
 
-        while m < 0:
-            y -= 1
-            m += 12
-
-        while d < 0:
+        if d < 0:
+            # step back one month and count days
+            # from (clamped) day in previous month of end_date
             m -= 1
-            if m < 0:
-                y -= 1
-                m += 12
-            d = self._add_ymd(y, m, 0)._diff_in_days(end_date)
+            if end_date.month == 1:
+                dim = days_in_month(end_date.year - 1, 12)
+            else:
+                dim = days_in_month(end_date.year, end_date.month - 1)
+            d = dim - min(self.day, dim) + end_date.day
+
+        # normalize months to 0 ... 11
+        q, m = divmod(m, 12)
+        y += q
 
         return int(y), int(m), int(d)
 
@@ -507,16 +588,12 @@ class BusinessDate(BaseDateDatetimeDate):
         For more details on the conventions
         see module :mod:`businessdate.daycount`.
         """
-        end = BusinessDate(end)
+        if not isinstance(end, BusinessDate):
+            end = BusinessDate(end)
+        day_count = day_count or self.day_count or self.__class__.DEFAULT_DAY_COUNT
         if isinstance(day_count, str):
-            dc_func = self.__class__._dc_func[day_count.lower()]
-            return dc_func(self, BusinessDate(end))
-        elif day_count:
-            return day_count(self, end)
-        elif self.day_count:
-            return self.day_count(self, end)
-        else:
-            return self.__class__.DEFAULT_DAY_COUNT(self, end)
+            day_count = self.__class__._dc_func[day_count.lower()]
+        return day_count(self, end)
 
     def get_year_fraction(self, end=None, day_count=None):
         """ wrapper for :meth:`BusinessDate.get_day_count`
@@ -548,7 +625,12 @@ class BusinessDate(BaseDateDatetimeDate):
 
         if isinstance(convention, str):
             adj_func = self.__class__._adj_func[convention.lower()]
-            return BusinessDate(adj_func(self, holidays))
+            # adjust a plain date, so stepping is native date arithmetic
+            # and holiday lookups hash plain dates
+            new = adj_func(self.to_date(), holidays)
+            return BusinessDate(new, convention=self.convention,
+                                holidays=self.holidays,
+                                day_count=self.day_count)
         else:
             return convention(self, holidays)
 
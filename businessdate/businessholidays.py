@@ -11,11 +11,30 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from datetime import date, timedelta
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from functools import lru_cache
 
 from .ymd import easter
 
 
+@lru_cache(maxsize=None)
+def target_days(year):
+    """
+    returns ecb target2 holidays of given calendar year
+
+    :param int year: calendar year
+    :return tuple(date):
+    """
+    e = date(*easter(year)).toordinal()
+    return (date(year, 1, 1),  # New Year's Day
+            date.fromordinal(e - 2),  # Black Friday
+            date.fromordinal(e + 1),  # Easter Monday
+            date(year, 5, 1),  # Labour Day
+            date(year, 12, 25),  # First Christmas Day
+            date(year, 12, 26))  # Second Christmas Day
+
+
 class BusinessHolidays(list):
     """ holiday calendar class
 
@@ -28,17 +47,81 @@ class BusinessHolidays(list):
     `year`, `month` and `day`.
     """
 
+    #: set: hash set of list items for fast lookup (rebuild on demand after any list modification)
+    _date_set = None
+    #: list: sorted ordinals of items on weekdays (rebuild on demand after any list modification)
+    _ordinals = None
+
     def __init__(self, iterable=()):
         if iterable:
             # iterable = map(BusinessDate, iterable)
             iterable = [bd if isinstance(bd, date) else date(bd.year, bd.month, bd.day) for bd in iterable]
         super(BusinessHolidays, self).__init__(iterable)
+        self._date_set = self._ordinals = None
 
     def __contains__(self, item):
-        if super().__contains__(item):
+        date_set = self._date_set
+        if date_set is None:
+            date_set = self._date_set = set(self)
+        if item in date_set:
             return True
-        item = date(item.year, item.month, item.day)
-        return super().__contains__(item)
+        if type(item) is date:
+            return False
+        return date(item.year, item.month, item.day) in date_set
+
+    def _count_weekday_holidays(self, first, last):
+        """ number of holidays on weekdays with ordinals in [first, last] """
+        ordinals = self._ordinals
+        if ordinals is None:
+            if self._date_set is None:
+                self._date_set = set(self)
+            # only dates matching date items by equality, i.e. no datetime
+            ordinals = (d.toordinal() for d in self._date_set
+                        if isinstance(d, date) and not isinstance(d, datetime))
+            ordinals = self._ordinals = sorted(o for o in ordinals if 0 < o % 7 < 6)
+        return bisect_right(ordinals, last) - bisect_left(ordinals, first)
+
+    # --- list modification methods (invalidate lookup set) ------------------
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._date_set = self._ordinals = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._date_set = self._ordinals = None
+
+    def __iadd__(self, other):
+        self._date_set = self._ordinals = None
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self._date_set = self._ordinals = None
+        return super().__imul__(other)
+
+    def append(self, item):
+        super().append(item)
+        self._date_set = self._ordinals = None
+
+    def extend(self, iterable):
+        super().extend(iterable)
+        self._date_set = self._ordinals = None
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._date_set = self._ordinals = None
+
+    def remove(self, item):
+        super().remove(item)
+        self._date_set = self._ordinals = None
+
+    def pop(self, index=-1):
+        self._date_set = self._ordinals = None
+        return super().pop(index)
+
+    def clear(self):
+        super().clear()
+        self._date_set = self._ordinals = None
 
 
 class BusinessHolidaysSet(set):
@@ -84,18 +167,18 @@ class TargetHolidays(BusinessHolidays):
 
     """
 
-    def __contains__(self, item):
-        if not super(TargetHolidays, self).__contains__(date(item.year, 1, 1)):
+    def _load(self, year):
+        # a year counts as loaded if its Jan, 1st is in the list,
+        # so clearing or copying the list needs no extra bookkeeping
+        if not super(TargetHolidays, self).__contains__(date(year, 1, 1)):
             # add tar days if not done jet
+            self.extend(target_days(year))
 
-            e = date(*easter(item.year))
-            target_days = dict()
-            target_days[date(item.year, 1, 1)] = "New Year's Day"
-            target_days[e - timedelta(2)] = "Black Friday"
-            target_days[e + timedelta(1)] = "Easter Monday"
-            target_days[date(item.year, 5, 1)] = "Labour Day"
-            target_days[date(item.year, 12, 25)] = "First Christmas Day"
-            target_days[date(item.year, 12, 26)] = "Second Christmas Day"
-
-            self.extend(list(target_days.keys()))
+    def __contains__(self, item):
+        self._load(item.year)
         return super(TargetHolidays, self).__contains__(item)
+
+    def _count_weekday_holidays(self, first, last):
+        for year in range(date.fromordinal(first).year, date.fromordinal(last).year + 1):
+            self._load(year)
+        return super(TargetHolidays, self)._count_weekday_holidays(first, last)
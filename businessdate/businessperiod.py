@@ -12,10 +12,29 @@
 
 
 from datetime import timedelta
+from functools import lru_cache
+from re import compile as _compile
 
 
 DAYS_IN_YEAR = 365.25
 
+_SPOT_PERIODS = {'': 0, '0D': 0, 'ON': 1, 'TN': 2, 'DD': 3}
+
+_PERIOD_PATTERN = _compile(
+    r'(?:(\+?-?\d+)B)?(?:(\+?-?\d+)Y)?(?:(\+?-?\d+)Q)?(?:(\+?-?\d+)M)?'
+    r'(?:(\+?-?\d+)W)?(?:(\+?-?\d+)D)?(?:(\+?-?\d+)B)?')
+
+
+@lru_cache(maxsize=1024)
+def _is_period_string(period):
+    # cached in both outcomes, since lru_cache on _parse_ymd
+    # does not cache the ValueError of non period strings
+    try:
+        BusinessPeriod._parse_ymd(period)
+    except ValueError:
+        return False
+    return True
+
 
 class BusinessPeriod:
     __slots__ = '_months', '_days', '_businessdays', 'origin'
@@ -72,16 +91,8 @@ class BusinessPeriod:
         elif period is None:
             pass
         elif isinstance(period, str):
-            if period.upper() == '':
-                pass
-            elif period.upper() == '0D':
-                pass
-            elif period.upper() == 'ON':
-                businessdays = 1
-            elif period.upper() == 'TN':
-                businessdays = 2
-            elif period.upper() == 'DD':
-                businessdays = 3
+            if period.upper() in _SPOT_PERIODS:
+                businessdays += _SPOT_PERIODS[period.upper()]
             else:
                 s, y, q, m, w, d, f = BusinessPeriod._parse_ymd(period)
                 # no final businesdays allowed
@@ -139,9 +150,16 @@ class BusinessPeriod:
     def businessdays(self):
         return int(self._businessdays)
 
+    def __getstate__(self):
+        return self._months, self._days, self._businessdays, self.origin
+
+    def __setstate__(self, state):
+        self._months, self._days, self._businessdays, self.origin = state
+
     # --- validation and information methods ---------------------------------
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def _parse_ymd(cls, period):
         # can even parse strings like '-1B-2Y-4Q+5M' but also '0B', '-1Y2M3D' as well.
         period = period.upper().replace(' ', '')
@@ -152,31 +170,11 @@ class BusinessPeriod:
         period = period.replace('WEEKS', 'W')
         period = period.replace('DAYS', 'D')
 
-        def _parse(p, letter):
-            if p.find(letter) >= 0:
-                s, p = p.split(letter, 1)
-                s = s[1:] if s.startswith('+') else s
-                sgn, s = (-1, s[1:]) if s.startswith('-') else (1, s)
-                if not s.isdigit():
-                    raise ValueError("Unable to parse %s in %s as %s" % (s, p, cls.__name__))
-                return sgn * int(s), p
-            return 0, p
-
-        p = period.upper()
-
-        # p[-1] is not 'B', p.strip('0123456789+-B')==''
-        s, p = _parse(p, 'B') if not p[-1]=='B' else (0, p)
-        s, p = _parse(p, 'B') if not p.strip('0123456789+-B') else (s, p)
-        s, p = _parse(p, 'B') if p.count('B') > 1 else (s, p)
-        y, p = _parse(p, 'Y')
-        q, p = _parse(p, 'Q')
-        m, p = _parse(p, 'M')
-        w, p = _parse(p, 'W')
-        d, p = _parse(p, 'D')
-        f, p = _parse(p, 'B')
-        if not p == '':
-            raise ValueError("Unable to parse %s as %s" % (p, cls.__name__))
-        return s, y, q, m, w, d, f
+        # single pass in fixed order spot B, Y, Q, M, W, D, final B
+        match = _PERIOD_PATTERN.fullmatch(period)
+        if match is None:
+            raise ValueError("Unable to parse %s as %s" % (period, cls.__name__))
+        return tuple(int(x.lstrip('+')) if x else 0 for x in match.groups())
 
     @classmethod
     def is_businessperiod(cls, period):
@@ -197,11 +195,7 @@ class BusinessPeriod:
                 return False
             #if period.upper().strip('+-0123456789BYQMWD'):
             #    return False
-            try:  # to be removed
-                BusinessPeriod._parse_ymd(period)
-            except ValueError:
-                return False
-            return True
+            return _is_period_string(period)
         return False
 
     # --- operator methods ---------------------------------------------------
@@ -212,19 +206,14 @@ class BusinessPeriod:
     def __str__(self):
 
         if self.businessdays:
-            period_str = str(self.businessdays) + 'B'
-        else:
-            period_str = '-' if self.years < 0 or self.months < 0 or self.days < 0 else ''
-            if self.years:
-                period_str += str(abs(self.years)) + 'Y'
-            if self.months:
-                period_str += str(abs(self.months)) + 'M'
-            if self.days:
-                period_str += str(abs(self.days)) + 'D'
-
-        if not period_str:
-            period_str = '0D'
-        return period_str
+            return f"{self.businessdays}B"
+        y, m, d = self.years, self.months, self.days
+        if not (y or m or d):
+            return '0D'
+        return ''.join(('-' if y < 0 or m < 0 or d < 0 else '',
+                        f"{abs(y)}Y" if y else '',
+                        f"{abs(m)}M" if m else '',
+                        f"{abs(d)}D" if d else ''))
 
     def __int__(self):
         if getattr(self, 'origin', None) is None:
@@ -241,6 +230,9 @@ class BusinessPeriod:
         y,m,d,b = tuple(map(abs, ymdb))
         return self.__class__(years=y, months=m, days=d, businessdays=b)
 
+    def _key(self):
+        return self.years, self.months, self.days, self.businessdays
+
     def __cmp__(self, other):
         other = self.__class__() if other == 0 else other
         if not isinstance(other, BusinessPeriod):
@@ -261,8 +253,7 @@ class BusinessPeriod:
 
     def __eq__(self, other):
         if isinstance(other, type(self)):
-            attr = 'years', 'months', 'days', 'businessdays'
-            return all(getattr(self, a) == getattr(other, a) for a in attr)
+            return self._key() == other._key()
         return False
 
     def __ne__(self, other):
@@ -286,7 +277,7 @@ class BusinessPeriod:
         return None if le is None else not le
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash(self._key())
 
     def __nonzero__(self):
         # return any((self.years, self.months, self.days, self.businessdays))
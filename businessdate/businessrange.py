@@ -10,10 +10,17 @@
 # Website:  https://github.com/sonntagsgesicht/businessdate
 # License:  Apache License 2.0 (see LICENSE file)
 
+from math import ceil
+
 from .businessperiod import BusinessPeriod
 from .businessdate import BusinessDate
 from .businessdatelist import BusinessDateList
 
+#: float: mean number of days per month in the gregorian calendar
+_MEAN_DAYS_PER_MONTH = 365.2425 / 12
+#: float: number of days per business day (ignoring holidays)
+_DAYS_PER_BUSINESSDAY = 7 / 5
+
 
 class BusinessRange(BusinessDateList):
     def __init__(self, start, stop=None, step=None, rolling=None):
@@ -43,9 +50,9 @@ class BusinessRange(BusinessDateList):
         start, stop, step, rolling = self._default_args(start, stop, step, rolling)
         schedule = self._build_grid(start, stop, step, rolling)
 
-        # push to super and sort
-        super(BusinessRange, self).__init__(set(schedule))
-        self.sort()
+        # push to super (grid is built strictly increasing,
+        # so neither dedup nor sort is needed)
+        super(BusinessRange, self).__init__(schedule)
 
     def __getitem__(self, key):
         return BusinessDateList(self).__getitem__(key)
@@ -63,30 +70,55 @@ class BusinessRange(BusinessDateList):
         if rolling is None:
             rolling = start
         # make proper businessdate objects
-        start = BusinessDate(start)
-        rolling = BusinessDate(rolling)
-        stop = BusinessDate(stop)
-        step = BusinessPeriod(step)
+        # (arguments of exactly the target type are taken as they are,
+        # since the grid only compares with or adds to them)
+        if type(start) is not BusinessDate:
+            start = BusinessDate(start)
+        if type(rolling) is not BusinessDate:
+            rolling = BusinessDate(rolling)
+        if type(stop) is not BusinessDate:
+            stop = BusinessDate(stop)
+        if type(step) is not BusinessPeriod:
+            step = BusinessPeriod(step)
         return start, stop, step, rolling
 
     @staticmethod
     def _build_grid(start, stop, step, rolling):
+        if not step:
+            raise ValueError("Zero step not allowed for BusinessRange")
+
         # setup grid and turn step into positive direction
         grid = list()
         step = step if rolling <= rolling + step else -1 * step
 
-        # roll backward before start
-        i = 0
-        while start <= rolling + step * i:
+        # grid point function with loop invariant step parts hoisted
+        if step.businessdays:
+            def grid_point(i):
+                return rolling.add_period(step * i)
+        else:
+            months, days = 12 * step.years + step.months, step.days
+
+            def grid_point(i):
+                return rolling._add_ymd(0, months * i, days * i)
+
+        # find first grid point not before start by estimating
+        # from mean step length and correcting by single steps
+        # (grid points increase strictly with i)
+        mean = _MEAN_DAYS_PER_MONTH * (12 * step.years + step.months) + \
+            step.days + _DAYS_PER_BUSINESSDAY * step.businessdays
+        i = ceil((start.toordinal() - rolling.toordinal()) / mean)
+        while start <= grid_point(i - 1):
             i -= 1
+        current = grid_point(i)
+        while current < start:
+            i += 1
+            current = grid_point(i)
 
         # fill grid from start until end
-        current = rolling + step * i
         while current < stop:
-            if start <= current < stop:
-                grid.append(current)
+            grid.append(current)
             i += 1
-            current = rolling + step * i
+            current = grid_point(i)
 
         return grid
 
@@ -42,9 +42,12 @@ class BusinessSchedule(BusinessRange):
                            holidays=roll.holidays,
                            day_count=roll.day_count)
         super(BusinessSchedule, self).__init__(start, end, step, roll)
-        if start not in self:
+        # range is sorted within [start, end), so only the first item
+        # can be start and only the last item can be end
+        # (plain list item access avoids the slicing __getitem__)
+        if not self or list.__getitem__(self, 0) != start:
             self.insert(0, start)
-        if end not in self:
+        if list.__getitem__(self, -1) != end:
             self.append(end)
 
     def __getitem__(self, item):
@@ -26,7 +26,8 @@ def is_business_day(business_date, holidays=()):
         return False
     if business_date in holidays:
         return False
-    if hasattr(business_date, 'to_date') and \
+    if not isinstance(business_date, date) and \
+            hasattr(business_date, 'to_date') and \
             business_date.to_date() in holidays:
         return False
     return True
@@ -88,10 +89,10 @@ def adjust_end_of_month(business_date, holidays=()):
 
 def adjust_imm(business_date, holidays=()):
     """ adjusts to Business Day Convention of "International Monetary Market". """
-    business_date = date(business_date.year, end_of_quarter_month(business_date.month), 15)
-    while business_date.weekday() == WEDNESDAY:
-        business_date += ONE_DAY
-    return business_date
+    y, m = business_date.year, end_of_quarter_month(business_date.month)
+    # third wednesday is the first wednesday on or after the 15th
+    d = 15 + (WEDNESDAY - date(y, m, 15).weekday()) % 7
+    return date(y, m, d)
 
 
 def adjust_cds_imm(business_date, holidays=()):
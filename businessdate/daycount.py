@@ -11,17 +11,21 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from datetime import date
-from .ymd import is_leap_year
+from datetime import date, datetime
+from .ymd import is_leap_year, days_in_year, day_of_year
 
 
 def diff_in_days(start, end):
     """ calculates days between start and end date """
-    if hasattr(start, 'to_date'):
+    if not isinstance(start, date) and hasattr(start, 'to_date'):
         start = start.to_date()
-    if hasattr(end, 'to_date'):
+    if not isinstance(end, date) and hasattr(end, 'to_date'):
         end = end.to_date()
-    return float((end-start).days)
+    if isinstance(start, date) and not isinstance(start, datetime) \
+            and isinstance(end, date) and not isinstance(end, datetime):
+        # plain dates, so ordinals save the intermediate timedelta
+        return end.toordinal() - start.toordinal()
+    return (end - start).days
 
 
 def get_30_360(start, end):
@@ -34,9 +38,9 @@ def get_30_360(start, end):
 def get_30e_360(start, end):
     """ implements the 30E/360 Day Count Convention. """
 
-    y1, m1, d1 = start.timetuple()[:3]
+    y1, m1, d1 = start.year, start.month, start.day
     # adjust to date immediately following the the last day
-    y2, m2, d2 = end.timetuple()[:3]
+    y2, m2, d2 = end.year, end.month, end.day
 
     d1 = min(d1, 30)
     d2 = min(d2, 30)
@@ -46,9 +50,9 @@ def get_30e_360(start, end):
 
 def get_30e_360i(start, end):
     """ implements the 30E/360 I. Day Count Convention. """
-    y1, m1, d1 = start.timetuple()[:3]
+    y1, m1, d1 = start.year, start.month, start.day
     # adjust to date immediately following the last day
-    y2, m2, d2 = end.timetuple()[:3]
+    y2, m2, d2 = end.year, end.month, end.day
 
     if (m1 == 2 and d1 >= 28) or d1 == 31:
         d1 = 30
@@ -83,17 +87,20 @@ def get_act_act(start, end):
     # What remains to check now is only whether the start and end year are leap or non-leap years. The quotients
     # can be easily calculated and for the years in between they are always one (365/365 = 1; 366/366 = 1)
 
-    if end.year - start.year == 0:
-        if is_leap_year(start.year):
+    y1, y2 = start.year, end.year
+    if y2 - y1 == 0:
+        if is_leap_year(y1):
             return diff_in_days(start, end) / 366.0  # leap year: 366 days
         return diff_in_days(start, end) / 365.0  # non-leap year: 365 days
 
-    rest_year1 = diff_in_days(start, date(start.year, 12, 31)) + 1  # since the first day counts
-    rest_year2 = abs(diff_in_days(end, date(end.year, 1, 1)))  # here the last day is automatically not counted
-    years_in_between = end.year - start.year - 1
+    # since the first day counts
+    rest_year1 = days_in_year(y1) - day_of_year(y1, start.month, start.day) + 1
+    # here the last day is automatically not counted
+    rest_year2 = day_of_year(y2, end.month, end.day) - 1
+    years_in_between = y2 - y1 - 1
 
-    return years_in_between + rest_year1 / (366.0 if is_leap_year(start.year) else 365.0) + rest_year2 / (
-        366.0 if is_leap_year(end.year) else 365.0)
+    return years_in_between + rest_year1 / (366.0 if is_leap_year(y1) else 365.0) + rest_year2 / (
+        366.0 if is_leap_year(y2) else 365.0)
 
 
 def get_act_act_icma(start, end, period_start=None, period_end=None, frequency=None):
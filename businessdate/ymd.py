@@ -11,15 +11,23 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from math import floor
+from array import array
+from functools import lru_cache
 
-#: list(int): non-leap year number of days per month
+#: tuple(int): non-leap year number of days per month
 _days_per_month = \
-    [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
-#: list(int): non-leap year cumulative number of days per month
+#: tuple(int): non-leap year cumulative number of days per month
 _cum_month_days = \
-    [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365]
+    (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365)
+
+#: tuple(int): maximal number of days per month (index 1 to 12) in any year
+_max_days_per_month = (0,) + _days_per_month[:1] + (29,) + _days_per_month[2:]
+
+#: tuple(int): cumulative number of days before each month of non-leap (first 12) and leap years (last 12)
+_days_before_month = \
+    _cum_month_days[:12] + tuple(d + (m > 1) for m, d in enumerate(_cum_month_days[:12]))
 
 #: dict: {year: (month, day)} of easter sunday dates from 1899 to 2200
 _easter_dates = {
@@ -105,7 +113,8 @@ def is_leap_year(year):
     :return bool:
     """
     # return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-    return year % 100 != 0 or year % 400 == 0 if year % 4 == 0 else False
+    # year % 400 == 0 iff year % 100 == 0 and year % 16 == 0 (since 400 = 16 * 25)
+    return not year % 4 and (year % 25 != 0 or not year % 16)
 
 
 def days_in_year(year):
@@ -119,7 +128,7 @@ def days_in_year(year):
     return 366 if is_leap_year(year) else 365
 
 
-def days_in_month(year, month):
+def days_in_month(year, month, _days_per_month=_days_per_month, _is_leap_year=is_leap_year):
     """
     returns number of days for the given year and month
 
@@ -129,12 +138,24 @@ def days_in_month(year, month):
     """
 
     eom = _days_per_month[month - 1]
-    if is_leap_year(year) and month == 2:
+    if month == 2 and _is_leap_year(year):
         eom += 1
 
     return eom
 
 
+def day_of_year(year, month, day):
+    """
+    returns number of the day in the given calendar year (Jan, 1st is 1)
+
+    :param int year: calendar year
+    :param int month: calendar month
+    :param int day: calendar day
+    :return int:
+    """
+    return _days_before_month[is_leap_year(year) * 12 + month - 1] + day
+
+
 def end_of_quarter_month(month):
     """
     method to return last month of quarter
@@ -142,9 +163,7 @@ def end_of_quarter_month(month):
     :param int month:
     :return: int
     """
-    while month % 3:
-        month += 1
-    return month
+    return (month + 2) // 3 * 3
 
 
 def is_valid_ymd(year, month, day):
@@ -161,7 +180,34 @@ def is_valid_ymd(year, month, day):
     return 1 <= month <= 12 and 1 <= day <= days_in_month(year, month) and year >= 1899
 
 
-def from_excel_to_ymd(excel_int):
+#: int: number of days in a full 400 year cycle of the gregorian calendar
+_DAYS_IN_CYCLE = 146097
+
+#: int: shift of int dates (after excel correction) to days since Mar, 1st 0000
+_EXCEL_CIVIL_OFFSET = 693900
+
+
+def _civil_from_days(days):
+    """
+    converts number of days since Mar, 1st 0000 into `(year, month, day)` tuple
+    (closed form by Howard Hinnant, years starting in March to put leap days at year end)
+
+    :param int days: days since Mar, 1st 0000
+    :return tuple(int, int, int):
+    """
+    era = days // _DAYS_IN_CYCLE
+    doe = days - era * _DAYS_IN_CYCLE
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+@lru_cache(maxsize=8192, typed=True)
+def from_excel_to_ymd(excel_int, _civil_from_days=_civil_from_days):
     """
     converts date in Microsoft Excel representation style and returns `(year, month, day)` tuple
 
@@ -169,36 +215,42 @@ def from_excel_to_ymd(excel_int):
     :return tuple(int, int, int):
     """
 
-    int_date = int(floor(excel_int))
+    int_date = int(excel_int // 1)
     int_date -= 1 if excel_int > 60 else 0
     # jd: There are two errors in excels own date <> int conversion.
     # The first is that there exists the 00.01.1900 and the second that there never happened to be a 29.2.1900 since it
     # was no leap year. So there is the int 60 <> 29.2.1900 which has to be jumped over.
 
-    year = (int_date - 1) // 365
-    rest_days = int_date - 365 * year - (year + 3) // 4 + (year + 99) // 100 - (year + 299) // 400
-    year += 1900
+    return _civil_from_days(int_date + _EXCEL_CIVIL_OFFSET)
 
-    while rest_days <= 0:
-        year -= 1
-        rest_days += days_in_year(year)
 
-    month = 1
-    if is_leap_year(year) and rest_days == 60:
-        month = 2
-        day = 29
-    else:
-        if is_leap_year(year) and rest_days > 60:
-            rest_days -= 1
+def _leaps(year):
+    """
+    returns number of leap years from 1 a.d. up to (and including) the given year
 
-        while rest_days > _cum_month_days[month]:
-            month += 1
+    :param int year: calendar year
+    :return int:
+    """
+    return year // 4 - year // 100 + year // 400
 
-        day = rest_days - _cum_month_days[month - 1]
-    return year, month, day
 
+def _days_to_year(year):
+    """
+    returns number of days from Jan, 1st 1900 to Jan, 1st of the given year
 
-def from_ymd_to_excel(year, month, day):
+    :param int year: calendar year
+    :return int:
+    """
+    return (year - 1900) * 365 + _leaps(year - 1) - _leaps(1899)
+
+
+#: array(int): cumulative number of days from Jan, 1st 1900 to Jan, 1st of the years 1900 to 2200
+_cum_year_days = array('l', (_days_to_year(y) for y in range(1900, 2201)))
+
+
+@lru_cache(maxsize=8192, typed=True)
+def from_ymd_to_excel(year, month, day, _max_days_per_month=_max_days_per_month, _is_leap_year=is_leap_year,
+                      _days_before_month=_days_before_month, _cum_year_days=_cum_year_days):
     """
     converts date as `year, month, day` tuple into Microsoft Excel representation style
 
@@ -207,15 +259,18 @@ def from_ymd_to_excel(year, month, day):
     :param int day:
     :return int:
     """
-    if not is_valid_ymd(year, month, day):
-        raise ValueError("Invalid date {0}.{1}.{2}".format(year, month, day))
+    # inlined is_valid_ymd(year, month, day)
+    if not 1 <= month <= 12 or not 1 <= day <= _max_days_per_month[month] or year < 1899 \
+            or (month == 2 and day == 29 and not _is_leap_year(year)):
+        raise ValueError(f"Invalid date {year}.{month}.{day}")
 
-    days = _cum_month_days[month - 1] + day
-    days += 1 if (is_leap_year(year) and month > 2) else 0
+    days = _days_before_month[_is_leap_year(year) * 12 + month - 1] + day
 
     years_distance = year - 1900
-    days += \
-        years_distance * 365 + (years_distance + 3) // 4 - (years_distance + 99) // 100 + (years_distance + 299) // 400
+    if 0 <= years_distance < 301:
+        days += _cum_year_days[int(years_distance)]
+    else:
+        days += _days_to_year(year)
 
     # count days since 30.12.1899 (excluding 30.12.1899) (workaround for excel bug)
     days += 1 if (year, month, day) > (1900, 2, 28) else 0
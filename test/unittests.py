@@ -11,7 +11,9 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
+import copy
 import os
+import pickle
 import sys
 import unittest
 
@@ -27,10 +29,51 @@ from businessdate.businessholidays import TargetHolidays
 from businessdate.basedate import BaseDateFloat, BaseDateDatetimeDate
 from businessdate.ymd import from_ymd_to_excel, from_excel_to_ymd, \
     is_valid_ymd, end_of_quarter_month, days_in_month, \
-    days_in_year, is_leap_year, easter
+    days_in_year, is_leap_year, easter, day_of_year
 
 TEST_DATA = "test/test_data/" if os.path.exists('test/test_data/') else "test_data/"
 
+_CUM_MONTH_DAYS = 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334, 365
+
+
+def _from_excel_to_ymd_slow(excel_int):
+    """
+    converts date in Microsoft Excel representation style and returns `(year, month, day)` tuple
+    (loop based reference implementation of :func:`from_excel_to_ymd`)
+
+    :param int excel_int: date as int (days since 1899-12-31)
+    :return tuple(int, int, int):
+    """
+
+    int_date = int(excel_int // 1)
+    int_date -= 1 if excel_int > 60 else 0
+    # jd: There are two errors in excels own date <> int conversion.
+    # The first is that there exists the 00.01.1900 and the second that there never happened to be a 29.2.1900 since it
+    # was no leap year. So there is the int 60 <> 29.2.1900 which has to be jumped over.
+
+    year = (int_date - 1) // 365
+    rest_days = int_date - 365 * year - (year + 3) // 4 + (year + 99) // 100 - (year + 299) // 400
+    year += 1900
+
+    while rest_days <= 0:
+        year -= 1
+        rest_days += days_in_year(year)
+
+    month = 1
+    if is_leap_year(year) and rest_days == 60:
+        month = 2
+        day = 29
+    else:
+        if is_leap_year(year) and rest_days > 60:
+            rest_days -= 1
+
+        while rest_days > _CUM_MONTH_DAYS[month]:
+            month += 1
+
+        day = rest_days - _CUM_MONTH_DAYS[month - 1]
+    return year, month, day
+
+
 def _silent(func, *args):
     _stout = sys.stdout
     sys.stdout = open(os.devnull, 'w')
@@ -74,12 +117,32 @@ class BaseDateUnitTest(unittest.TestCase):
 
             days = 30 if m in (4, 6, 9, 11) else 31 if m != 2 else 29 if leap else 28
             self.assertEqual(days, days_in_month(y, m))
+            self.assertEqual(date(*ymd).timetuple().tm_yday, day_of_year(*ymd))
+
+        for y in range(10000):
+            leap = (y % 4 == 0 and y % 100 != 0) or (y % 400 == 0)
+            self.assertEqual(leap, is_leap_year(y))
+
+        # integral floats are accepted as before
+        self.assertTrue(is_leap_year(2000.0))
+        self.assertEqual(29, days_in_month(2016.0, 2))
+        self.assertEqual(42429, from_ymd_to_excel(2016.0, 2, 29))
+
+        # cached results keep the type of the arguments
+        self.assertIs(float, type(from_ymd_to_excel(2016, 3, 1.0)))
+        self.assertIs(int, type(from_ymd_to_excel(2016, 3, 1)))
+        self.assertEqual((2016, 3, 1), from_excel_to_ymd(42430.0))
+        self.assertIs(int, type(from_excel_to_ymd(42430)[0]))
+
+        for i in range(-1, 150000, 7):
+            self.assertEqual(_from_excel_to_ymd_slow(i), from_excel_to_ymd(i))
 
     def test_base_date_float(self):
         for ymd, f in self.pairs:
             bd = BaseDateFloat(f)
 
             self.assertEqual(f, bd)
+            self.assertIs(bd, BaseDateFloat(f))
 
             self.assertEqual(ymd, (bd.year, bd.month, bd.day))
 
@@ -96,7 +159,7 @@ class BaseDateUnitTest(unittest.TestCase):
             self.assertEqual(b, a._add_days(1))
             self.assertEqual(a, b._add_days(-1))
 
-            self.assertTrue(bd._add_days(0)._ymd is None)
+            self.assertEqual(ymd, bd._add_days(0)._ymd)
 
             y, m, d = ymd
             self.assertEqual(d, bd._add_days(0).day)
@@ -106,8 +169,25 @@ class BaseDateUnitTest(unittest.TestCase):
             self.assertEqual(1, a._diff_in_days(b))
             self.assertEqual(-1, b._diff_in_days(a))
 
+            self.assertEqual(date(*ymd).weekday(), bd.weekday())
             self.assertEqual(5, BaseDateFloat.from_ymd(2016, 12, 31).weekday())
 
+        # subclass instances carry attributes and must not be shared
+        class SubDateFloat(BaseDateFloat):
+            pass
+
+        a = SubDateFloat(42000)
+        a.convention = 'mod_follow'
+        SubDateFloat(42000).convention = 'follow'
+        self.assertEqual('mod_follow', a.convention)
+        self.assertIsNot(a, SubDateFloat(42000))
+
+        bd = BaseDateFloat(42000.)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            p = pickle.loads(pickle.dumps(bd, protocol))
+            self.assertEqual(bd, p)
+            self.assertEqual(bd.to_ymd(), p.to_ymd())
+
     def test_base_date_datetime(self):
         for ymd, f in self.pairs:
             bd = BaseDateDatetimeDate(*ymd)
@@ -127,6 +207,7 @@ class BaseDateUnitTest(unittest.TestCase):
 
             a, b = bd, BaseDateDatetimeDate.from_date(date(*ymd) + timedelta(1))
             self.assertEqual(b, a._add_days(1))
+            self.assertIs(BaseDateDatetimeDate, type(a._add_days(1)))
             self.assertEqual(a, b._add_days(-1))
             self.assertEqual(1, a._diff_in_days(b))
             self.assertEqual(-1, b._diff_in_days(a))
@@ -206,6 +287,22 @@ class BusinessHolidaysUnitTests(unittest.TestCase):
                     self.assertTrue(d not in t)
                 d += timedelta(1)
 
+    def test_target_days_reload(self):
+        t = TargetHolidays()
+        self.assertTrue(date(2016, 1, 1) in t)
+        t.clear()
+        self.assertTrue(date(2016, 1, 1) in t)
+        del t[:]
+        self.assertTrue(date(2016, 1, 1) in t)
+        t.remove(date(2016, 1, 1))
+        self.assertTrue(date(2016, 1, 1) in t)
+
+        c = copy.copy(t)
+        self.assertTrue(date(2017, 1, 1) in c)
+        self.assertTrue(date(2017, 1, 1) in t)
+        self.assertTrue(date(2018, 12, 25) in t)
+        self.assertTrue(date(2018, 12, 25) in c)
+
     def test_business_holidays(self):
         self.assertTrue(BusinessDate(20160101).to_date() in self.holidays)
         self.assertFalse(BusinessDate(20160102).to_date() in self.holidays)
@@ -302,6 +399,11 @@ class BusinessDateUnitTests(unittest.TestCase):
         self.assertEqual(repr(self.jan02), "BusinessDate(20160102)")
         self.assertEqual(str(BusinessDate(42371)), '20160102')
         self.assertEqual(self.jan02, eval(repr(self.jan02)))
+        self.addCleanup(setattr, BusinessDate, 'DATE_FORMAT', BusinessDate.DATE_FORMAT)
+        for f in ('%Y%m%d', '%Y-%m-%d', '%d.%m.%Y', '%m/%d/%Y', '%Y %j'):
+            BusinessDate.DATE_FORMAT = f
+            for d in (date(1000, 1, 1), date(2016, 12, 31), date(9999, 12, 31)):
+                self.assertEqual(str(BusinessDate(d)), d.strftime(f))
 
     def test_properties(self):
         self.assertEqual(self.jan01.day, 1)
@@ -378,6 +480,8 @@ class BusinessDateUnitTests(unittest.TestCase):
         self.assertEqual(self.jan01._add_days(1), self.jan02)
         self.assertEqual(self.jan01._add_ymd(0, 1, 0), self.feb01)
         self.assertEqual(str(self.jan01._add_ymd(1, 0, 0)), '20170101')
+        self.assertEqual(str(self.jan01._add_ymd(0, 24, 0)), '20180101')
+        self.assertEqual(str(self.jan01._add_ymd(0, -25, 0)), '20131201')
         self.assertEqual(self.jan01.add_period('2D'), self.jan02 + BusinessPeriod('1D'))
         self.assertEqual(self.jan02.add_period('-2D'), self.jan01 - BusinessPeriod('1D'))
         self.assertEqual(self.jan02.add_period('-1b'), self.jan01 - BusinessPeriod('1b'))
@@ -536,10 +640,21 @@ class BusinessDateUnitTests(unittest.TestCase):
         # self.assertEqual(modprevious(self.jan01.to_date(), BusinessDate.DEFAULT_HOLIDAYS),
         #                 BusinessDate(20160104).to_date())
 
-        self.assertEqual(self.jan01.adjust('imm'), BusinessDate(20160315))
-        self.assertEqual(self.jan01.adjust_imm(), BusinessDate(20160315))
-        self.assertEqual(BusinessDate(20160601).adjust('imm'), BusinessDate(20160616))
-        self.assertEqual(BusinessDate(20160601).adjust_imm(), BusinessDate(20160616))
+        self.assertEqual(self.jan01.adjust('imm'), BusinessDate(20160316))
+        self.assertEqual(self.jan01.adjust_imm(), BusinessDate(20160316))
+        self.assertEqual(BusinessDate(20160601).adjust('imm'), BusinessDate(20160615))
+        self.assertEqual(BusinessDate(20160601).adjust_imm(), BusinessDate(20160615))
+        d = BusinessDate(20160601, day_count='act_act')
+        for c in ('follow', 'mod_follow', 'end_of_month', 'imm'):
+            self.assertEqual(BusinessDate, type(d.adjust(c)))
+            self.assertEqual('act_act', d.adjust(c).day_count)
+        self.assertEqual(d.get_day_count(BusinessDate(20170601), 'act_act'),
+                         d.get_day_count(BusinessDate(20170601)))
+        for y in range(2000, 2030):
+            for m in range(1, 13):
+                imm = BusinessDate(y, m, 1).adjust_imm()
+                self.assertEqual(2, imm.weekday())
+                self.assertTrue(15 <= imm.day <= 21)
         # self.assertEqual(imm(self.jan01.to_date(), BusinessDate.DEFAULT_HOLIDAYS), BusinessDate(20160315).to_date())
 
         self.assertEqual(self.jan01.adjust('cds_imm'), BusinessDate(20160320))
@@ -593,6 +708,28 @@ class BusinessDateUnitTests(unittest.TestCase):
         b = d._add_business_days(2)  # default holidays contains the target days, i.e. the 1.1.2016
         self.assertEqual(target_b, b)
 
+        # jumping over weeks gives the same as stepping day by day
+        for n in (-500, -250, -23, -3, 3, 23, 250, 500):
+            for holidays in (holi, TargetHolidays(), [date(2016, 3, 1)]):
+                c, s = d, 1 if n > 0 else -1
+                for _ in range(abs(n)):
+                    c = c._add_business_days(s, holidays)
+                self.assertEqual(c, d._add_business_days(n, holidays))
+
+        # calendars filling themselves on lookup are walked day by day
+        class LazyHolidays(BusinessHolidays):
+            def __contains__(self, item):
+                if not self:
+                    self.extend((date(2016, 3, 2), date(2016, 3, 3)))
+                return super(LazyHolidays, self).__contains__(item)
+
+        d = BusinessDate(20160301)
+        c = d
+        for _ in range(3):
+            c = c._add_business_days(1, LazyHolidays())
+        self.assertEqual(BusinessDate(20160308), c)
+        self.assertEqual(c, d._add_business_days(3, LazyHolidays()))
+
     def test_from_businesperiod_str(self):
         self.assertEqual(BusinessDate() + '1B', BusinessDate('1B'))
         self.assertEqual(BusinessDate() + '1w', BusinessDate('1w'))
@@ -638,6 +775,10 @@ class BusinessPeriodUnitTests(unittest.TestCase):
             self.assertEqual(d(p), BusinessPeriod._parse_ymd(f(p)))
         for p in ('1000001', '0100001', '1010001', '1101011', '0110100', '0010010', '1111111'):
             self.assertEqual(d(p), BusinessPeriod._parse_ymd(f(p)))
+        self.assertEqual((0, 1, 0, 2, 0, 0, 0), BusinessPeriod._parse_ymd('1 years 2 months'))
+        self.assertEqual((0, -1, 0, 0, 0, 3, 0), BusinessPeriod._parse_ymd('+-1Y3D'))
+        self.assertRaises(ValueError, BusinessPeriod._parse_ymd, '2M1Y')
+        self.assertRaises(ValueError, BusinessPeriod._parse_ymd, '1B2B3B')
 
     def test_constructors(self):
         self.assertEqual(BusinessPeriod(), BusinessPeriod(years=0))
@@ -777,6 +918,9 @@ class BusinessPeriodUnitTests(unittest.TestCase):
         self.assertNotEqual(hash(BusinessPeriod('3D')), hash(BusinessPeriod('3W')))
         self.assertNotEqual(hash(BusinessPeriod('3D')), hash(BusinessPeriod('1D')))
         self.assertNotEqual(hash(BusinessPeriod('3D')), hash(BusinessPeriod('3B')))
+        self.assertEqual(hash(BusinessPeriod('1Y')), hash(BusinessPeriod('12M')))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(self._1y6m, pickle.loads(pickle.dumps(self._1y6m, protocol)))
 
     def test_max_min_days(self):
         jan31 = BusinessDate(20010131)
@@ -909,6 +1053,8 @@ class BusinessRangeUnitTests(unittest.TestCase):
         ck = BusinessRange(20151231, 20160531, '-1M', 20151231)
         self.assertEqual(bs, ck)
 
+        self.assertRaises(ValueError, BusinessRange, self.sd, self.ed, '0D')
+
         BusinessDate.BASE_DATE = 20151231
         bs = BusinessRange(20201231, step='1y')
         ck = [BusinessDate('20151231'),
@@ -953,7 +1099,7 @@ class BusinessScheduleUnitTests(unittest.TestCase):
         self.assertEqual(bs, ck)
 
         bs.adjust('imm')
-        ck = BusinessDate([20150315, 20150615, 20150915, 20151215, 20160315, 20160616, 20160915, 20160915])
+        ck = BusinessDate([20150318, 20150617, 20150916, 20151216, 20160316, 20160615, 20160921, 20160921])
         self.assertEqual(bs, ck)
 
         bs = BusinessSchedule(20150101, 20170101, '3M', 20170101)
@@ -1045,6 +1191,11 @@ class OldDateUnitTests(unittest.TestCase):
         diff = BusinessPeriod(years=y, months=m, days=d)
         self.assertEqual('1Y6M20D', str(diff))
 
+        self.assertEqual((-4, -10, -14), BusinessDate.diff_in_ymd(
+            BusinessDate.from_ymd(2020, 1, 31), BusinessDate.from_ymd(2015, 3, 17)))
+        self.assertEqual((0, 0, -1), BusinessDate.diff_in_ymd(
+            BusinessDate.from_ymd(2020, 3, 1), BusinessDate.from_ymd(2020, 2, 29)))
+
 
 class OldBusinessDateUnitTests(unittest.TestCase):
     """tests the date class """